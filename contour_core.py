@@ -0,0 +1,230 @@
+# === contour_core.py ===
+# Shared contour pipeline for the groundwater and nitrate overlays.
+
+import os
+import sys
+import orjson
+import math
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from matplotlib import colormaps
+from matplotlib.figure import Figure
+from matplotlib.patches import Rectangle
+from scipy.interpolate import CloughTocher2DInterpolator
+from scipy.spatial import Delaunay
+import tkinter as tk
+from tkinter import filedialog, messagebox
+from pyproj import Transformer
+from numba import njit, prange
+
+OUTPUT_DIR = "output_files"
+CONTOUR_IMAGE = os.path.join(OUTPUT_DIR, "groundwater_contour_true_scale.png")
+GRID_SIZE = 100
+
+# render_contour() keyword arguments for each report type
+GROUNDWATER = {
+    "value_column": "Groundwater Elevation mAHD",
+    "cmap": "viridis",
+    "out_png": CONTOUR_IMAGE,
+    "out_bounds_json": os.path.join(OUTPUT_DIR, "image_bounds.json"),
+    "quiver": True,
+    "alpha": 0.6,
+    "point_color": "black",
+    "toc1_only": True,
+    # Contour interval picked by the first threshold the value range exceeds
+    "level_thresholds": (0.5, 1, 2, 5, 10),
+    "level_intervals": (0.01, 0.05, 0.1, 0.2, 0.5, 1.0),
+    "levels_from_grid": False,
+}
+NITRATE = {
+    "value_column": "Nitrate",
+    "cmap": "plasma",
+    "out_png": CONTOUR_IMAGE,
+    "out_bounds_json": os.path.join(OUTPUT_DIR, "nitrate_bounds.json"),
+    "quiver": False,
+    "alpha": 0.7,
+    "point_color": None,
+    "toc1_only": False,
+    "level_thresholds": (2, 5, 10),
+    "level_intervals": (0.1, 0.2, 0.5, 1.0),
+    "levels_from_grid": True,
+}
+
+@lru_cache(maxsize=None)
+def get_transformer(src_crs, dst_crs):
+    """Return a cached Transformer so the PROJ pipeline is only built once per CRS pair."""
+    return Transformer.from_crs(src_crs, dst_crs, always_xy=True)
+
+def select_file_gui():
+    root = tk.Tk()
+    root.withdraw()
+    file_path = filedialog.askopenfilename(
+        title="Select Excel File",
+        filetypes=[("Excel files", "*.xlsx *.xls")]
+    )
+    if not file_path:
+        messagebox.showwarning("No file selected", "Please select an Excel file to proceed.")
+        sys.exit(0)
+    return file_path
+
+@njit(parallel=True, cache=True)
+def grad_uv(z, u, v):
+    """Write the unit downhill flow direction of z into u and v in a single pass.
+
+    Matches np.gradient (central differences inside, one-sided at the edges)
+    followed by normalisation, without the intermediate arrays.
+    """
+    rows, cols = z.shape
+    for i in prange(rows):
+        for j in range(cols):
+            if i == 0:
+                dx = z[1, j] - z[0, j]
+            elif i == rows - 1:
+                dx = z[i, j] - z[i - 1, j]
+            else:
+                dx = 0.5 * (z[i + 1, j] - z[i - 1, j])
+            if j == 0:
+                dy = z[i, 1] - z[i, 0]
+            elif j == cols - 1:
+                dy = z[i, j] - z[i, j - 1]
+            else:
+                dy = 0.5 * (z[i, j + 1] - z[i, j - 1])
+            magnitude = math.hypot(dx, dy) + 1e-10
+            u[i, j] = -dx / magnitude
+            v[i, j] = -dy / magnitude
+
+def interpolate_grid(easting, northing, values, query):
+    """Cubic Clough-Tocher interpolation of the samples at the (M, 2) query points; NaN outside the data hull."""
+    tri = Delaunay(np.column_stack([easting, northing]))
+    return CloughTocher2DInterpolator(tri, values)(query)
+
+def load_points(file_path, value_column, toc1_only=False):
+    """Read Easting/Northing/value rows from the Excel file, dropping anything non-numeric."""
+    # Only parse the columns the contour needs; headers are matched after stripping whitespace
+    wanted_columns = {'Name', 'Easting', 'Northing', value_column}
+    df = pd.read_excel(file_path, engine='calamine', usecols=lambda c: str(c).strip() in wanted_columns)
+    df.columns = df.columns.str.strip()
+
+    if toc1_only and 'Name' in df.columns and df['Name'].astype(str).str.contains('TOC1', na=False).any():
+        df = df[df['Name'].str.contains('TOC1', na=False)]
+
+    # Coerce all three columns in one assign ('-' placeholders become NaN) and drop once
+    df = df.assign(**{
+        column: pd.to_numeric(df[column], errors='coerce')
+        for column in ('Easting', 'Northing', value_column)
+    })
+    return df.dropna(subset=['Easting', 'Northing', value_column])
+
+def render_contour(file_path, value_column, cmap, out_png, out_bounds_json, quiver=False,
+                   alpha=0.6, point_color=None, toc1_only=False,
+                   level_thresholds=(0.5, 1, 2, 5, 10), level_intervals=(0.01, 0.05, 0.1, 0.2, 0.5, 1.0),
+                   levels_from_grid=False):
+    """Interpolate value_column over the survey area and save the overlay PNG and its lat/lon bounds.
+
+    point_color=None colours the sample points by value with cmap; quiver=True
+    adds downhill flow arrows. level_intervals has one more entry than
+    level_thresholds; levels_from_grid spans the levels over the interpolated
+    surface instead of the sample values.
+    """
+    os.makedirs(os.path.dirname(out_png) or ".", exist_ok=True)
+    os.makedirs(os.path.dirname(out_bounds_json) or ".", exist_ok=True)
+
+    df = load_points(file_path, value_column, toc1_only=toc1_only)
+    easting = df['Easting'].to_numpy(dtype=np.float64, copy=False)
+    northing = df['Northing'].to_numpy(dtype=np.float64, copy=False)
+    values = df[value_column].to_numpy(dtype=np.float64, copy=False)
+
+    # Interpolation grid (in meters)
+    # 1-D axes stay float64 so UTM query points are not rounded off the data hull;
+    # the plotting grids are sparse float32 views that broadcast to (GRID_SIZE, GRID_SIZE)
+    min_easting, max_easting = easting.min(), easting.max()
+    min_northing, max_northing = northing.min(), northing.max()
+    grid_xs = np.linspace(min_easting, max_easting, GRID_SIZE)
+    grid_ys = np.linspace(min_northing, max_northing, GRID_SIZE)
+    grid_x, grid_y = np.meshgrid(grid_xs.astype(np.float32), grid_ys.astype(np.float32), indexing='ij', sparse=True)
+
+    # Reproject grid corners to get lat/lon bounds
+    lons, lats = get_transformer("EPSG:32755", "EPSG:4326").transform(
+        [min_easting, max_easting], [min_northing, max_northing]
+    )
+    min_lon, max_lon = min(lons), max(lons)
+    min_lat, max_lat = min(lats), max(lats)
+
+    bounds_dict = {
+        "min_lat": min_lat,
+        "min_lon": min_lon,
+        "max_lat": max_lat,
+        "max_lon": max_lon
+    }
+    with open(out_bounds_json, "wb") as f:
+        f.write(orjson.dumps(bounds_dict, option=orjson.OPT_SERIALIZE_NUMPY))
+
+    # Interpolation on the flattened grid (the only place a dense coordinate grid is needed)
+    query_x, query_y = np.meshgrid(grid_xs, grid_ys, indexing='ij')
+    grid_z = interpolate_grid(easting, northing, values,
+                              np.stack([query_x.ravel(), query_y.ravel()], axis=-1))
+    grid_z = grid_z.reshape(grid_xs.size, grid_ys.size)
+    grid_z = grid_z.astype(np.float32, copy=False)
+
+    if levels_from_grid:
+        z_min, z_max = np.nanmin(grid_z), np.nanmax(grid_z)
+    else:
+        z_min, z_max = df[value_column].min(), df[value_column].max()
+    z_range = z_max - z_min
+    # Pick the contour interval from the data range (strictly greater than each threshold)
+    interval = np.asarray(level_intervals)[np.searchsorted(level_thresholds, z_range)]
+
+    # linspace with an explicit count avoids the missing/duplicated last level of a float-stride arange
+    level_lo = np.floor(z_min / interval) * interval
+    level_hi = np.ceil(z_max / interval) * interval
+    contour_levels = np.linspace(level_lo, level_hi, int(round((level_hi - level_lo) / interval)) + 1)
+
+    # Fixed-size figure with the axes filling it, so the PNG maps straight onto the
+    # overlay bounds and savefig needs no second tight-bbox render pass.
+    # A bare Figure (no pyplot) keeps rendering safe off the Tk main thread.
+    fig = Figure(figsize=(10, 10), dpi=150, facecolor='none')
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.patch.set_alpha(0)
+
+    # Colour each grid cell by its contour band directly rather than tracing contours;
+    # band midpoints map onto the colormap the same way contourf does
+    n_bands = max(len(contour_levels) - 1, 1)
+    band = np.clip(np.digitize(grid_z, contour_levels) - 1, 0, n_bands - 1)
+    rgba = colormaps[cmap]((band + 0.5) / n_bands, bytes=True)
+    rgba[..., 3] = round(alpha * 255)
+    # Like contourf, leave cells outside the level range (and outside the hull) transparent
+    rgba[np.isnan(grid_z) | (grid_z < contour_levels[0]) | (grid_z > contour_levels[-1])] = 0
+    # grid_z is indexed [easting, northing]; pixel centres sit on the grid nodes
+    half_dx = (grid_xs[1] - grid_xs[0]) / 2
+    half_dy = (grid_ys[1] - grid_ys[0]) / 2
+    ax.imshow(rgba.transpose(1, 0, 2), origin='lower', interpolation='nearest', aspect='auto',
+              extent=(min_easting - half_dx, max_easting + half_dx, min_northing - half_dy, max_northing + half_dy))
+
+    if point_color is None:
+        ax.scatter(easting, northing, c=values, cmap=cmap,
+                   edgecolor='black', linewidth=0.7, s=50)
+    else:
+        ax.scatter(easting, northing, color=point_color,
+                   edgecolor='black', linewidth=0.8, s=40)
+
+    if quiver:
+        u = np.empty_like(grid_z)
+        v = np.empty_like(grid_z)
+        grad_uv(grid_z, u, v)
+        step = 10
+        arrow_x, arrow_y = np.broadcast_arrays(grid_x[::step], grid_y[:, ::step])
+        ax.quiver(arrow_x, arrow_y, u[::step, ::step], v[::step, ::step],
+                  color='red', scale=25, width=0.002)
+
+    # Bounding box rectangle
+    bbox_rect = Rectangle((min_easting, min_northing), max_easting - min_easting, max_northing - min_northing,
+                          linewidth=2, edgecolor='blue', facecolor='none', linestyle='--')
+    ax.add_patch(bbox_rect)
+
+    ax.set_xlim(min_easting, max_easting)
+    ax.set_ylim(min_northing, max_northing)
+    ax.set_axis_off()
+    fig.savefig(out_png, dpi=150, pad_inches=0)
+
+    print(f"\n{value_column} contour image and bounding box saved.")
@@ -1,24 +1,17 @@
 # generate_map.py
 
 import os
+import mmap
 from zipfile import ZipFile
 from pykml import parser
-from shapely.geometry import Point, box, mapping
+import numpy as np
+import orjson
+from shapely.geometry import box, mapping
 import geopandas as gpd
-import ee
-import geemap.foliumap as geemap
 import folium
 from folium.raster_layers import ImageOverlay
 
 
-# === Authenticate and Initialize Earth Engine ===
-try:
-    ee.Initialize(project='mynewproject-469023')
-except Exception:
-    ee.Authenticate()
-    ee.Initialize(project='mynewproject-469023')
-
-
 def extract_kmz_points_and_bounds(kmz_path: str, extract_dir: str = "extracted"):
     """Extract points and bounding box from KMZ."""
     os.makedirs(extract_dir, exist_ok=True)
@@ -41,22 +34,26 @@ def extract_kmz_points_and_bounds(kmz_path: str, extract_dir: str = "extracted")
     if not placemarks:
         raise ValueError("No Point placemarks found in the KML.")
 
-    points = []
-    for i, pm in enumerate(placemarks):
-        coords = pm.Point.coordinates.text.strip()
-        lon, lat, *_ = map(float, coords.split(','))
-        points.append(Point(lon, lat))
-        print(f" Point {i+1}: Longitude = {lon:.6f}, Latitude = {lat:.6f}")
+    # Parse every "lon,lat[,alt]" string in one go and build the geometry column vectorised
+    coords = np.array(
+        [pm.Point.coordinates.text.strip().split(',')[:2] for pm in placemarks],
+        dtype=np.float64
+    )
+    print(f" Parsed {len(coords)} points (lon, lat):\n{np.array2string(coords, precision=6)}")
 
-    gdf = gpd.GeoDataFrame(geometry=points, crs="EPSG:4326")
+    gdf = gpd.GeoDataFrame(geometry=gpd.points_from_xy(coords[:, 0], coords[:, 1]), crs="EPSG:4326")
+    points = list(gdf.geometry)
     minx, miny, maxx, maxy = gdf.total_bounds
     image_bounds = [[miny, minx], [maxy, maxx]]
     bbox = box(minx, miny, maxx, maxy)
 
-    # Save bbox as GeoJSON
-    gpd.GeoDataFrame(geometry=[bbox], crs="EPSG:4326").to_file(
-        os.path.join(extract_dir, "kmz_bbox.geojson"), driver="GeoJSON"
-    )
+    # Save bbox as GeoJSON (written directly; a single feature doesn't need the OGR driver)
+    bbox_collection = {
+        "type": "FeatureCollection",
+        "features": [{"type": "Feature", "geometry": mapping(bbox), "properties": {}}]
+    }
+    with open(os.path.join(extract_dir, "kmz_bbox.geojson"), "wb") as f:
+        f.write(orjson.dumps(bbox_collection))
 
     return points, image_bounds, bbox
 
@@ -64,7 +61,8 @@ def extract_kmz_points_and_bounds(kmz_path: str, extract_dir: str = "extracted")
 def display_interactive_map(image_path, image_bounds, points, bbox, output_html="interactive_map.html"):
     """Render interactive map with image overlay, markers, and bounding box."""
     center = [points[0].y, points[0].x]
-    m = geemap.Map(center=center, zoom=16, basemap='SATELLITE')
+    # Esri satellite tiles need no Earth Engine authentication
+    m = folium.Map(location=center, zoom_start=16, tiles='Esri.WorldImagery')
 
     # Add image overlay
     image_overlay = ImageOverlay(
@@ -79,33 +77,40 @@ def display_interactive_map(image_path, image_bounds, points, bbox, output_html=
     image_overlay.options['smooth'] = False
     image_overlay.add_to(m)
 
-    # Add points as blue dots
-    for pt in points:
-        folium.CircleMarker(
-            location=[pt.y, pt.x],
+    # Add points as blue dots, as one GeoJSON layer rather than a Leaflet layer per point
+    points_geojson = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [pt.x, pt.y]},
+                "properties": {"label": "KMZ Point"}
+            }
+            for pt in points
+        ]
+    }
+    folium.GeoJson(
+        points_geojson,
+        name='KMZ Points',
+        marker=folium.CircleMarker(
             radius=2,
             color='blue',
             fill=True,
             fill_color='blue',
-            fill_opacity=0.8,
-            popup='KMZ Point'
-        ).add_to(m)
+            fill_opacity=0.8
+        ),
+        popup=folium.GeoJsonPopup(fields=['label'], labels=False)
+    ).add_to(m)
 
     # Add bounding box
-    bbox_geojson = {
-        "type": "Feature",
-        "geometry": mapping(bbox),
-        "properties": {}
-    }
-    folium.GeoJson(
-        bbox_geojson,
+    minx, miny, maxx, maxy = bbox.bounds
+    folium.Rectangle(
+        bounds=[[miny, minx], [maxy, maxx]],
         name='KMZ Bounding Box',
-        style_function=lambda x: {
-            "color": "blue",
-            "weight": 0.5,
-            "dashArray": "5, 5",
-            "fillOpacity": 0.0
-        }
+        color='blue',
+        weight=0.5,
+        dash_array='5, 5',
+        fill=False
     ).add_to(m)
 
     # Save map
@@ -115,12 +120,8 @@ def display_interactive_map(image_path, image_bounds, points, bbox, output_html=
     inject_bounds_script(output_html)
 
 
-def inject_bounds_script(html_file):
-    """Inject robust controls: mutation-observer + composed transforms so rotation sticks."""
-    with open(html_file, "r", encoding="utf-8") as f:
-        html = f.read()
-
-    js_code = r"""
+# Overlay move/scale/rotate controls appended to the generated map page
+BOUNDS_CONTROLS_HTML = r"""
 <div style="position:absolute; top:10px; right:10px; z-index:9999; background:rgba(255,255,255,0.95); padding:10px; border-radius:6px; font-family:Arial,Helvetica,sans-serif;">
   <div style="margin-bottom:8px;">
     <label>Move Scale: </label>
@@ -351,12 +352,27 @@ def inject_bounds_script(html_file):
 })();
 </script>
 """
+BOUNDS_CONTROLS_BYTES = (BOUNDS_CONTROLS_HTML + "\n").encode("utf-8")
 
-    if "</body>" in html:
-        html = html.replace("</body>", js_code + "\n</body>")
 
-    with open(html_file, "w", encoding="utf-8") as f:
-        f.write(html)
+def inject_bounds_script(html_file):
+    """Inject robust controls: mutation-observer + composed transforms so rotation sticks."""
+    # Splice the controls in before the last </body> in place, rewriting only the tail
+    if os.path.getsize(html_file) == 0:
+        return
+
+    with open(html_file, "r+b") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            body_end = mm.rfind(b"</body>")
+        if body_end < 0:
+            return
+
+        f.seek(body_end)
+        tail = f.read()
+        f.seek(body_end)
+        f.truncate()
+        f.write(BOUNDS_CONTROLS_BYTES)
+        f.write(tail)
 
 import os
 import sys
@@ -1,16 +1,16 @@
 import tkinter as tk
-from tkinter import messagebox, font
-import subprocess
+from tkinter import filedialog, messagebox, font
+import multiprocessing as mp
+import queue
 import os
 import webbrowser
+from report_worker import worker_loop
 #edit by andy
 # --- CONFIGURATION & CONSTANTS ---
 
-# Paths to your scripts and output files
-GENERATE_IMAGE_SCRIPT = "generate_image.py"
-GENERATE_NITRATE_IMAGE_SCRIPT = "generate_image_nitrate.py"
-GENERATE_MAPS_SCRIPT = "generate_maps.py"
+# Output files
 INTERACTIVE_MAP_HTML = "interactive_map.html"
+POLL_INTERVAL_MS = 100  # how often the UI checks the worker for progress
 
 # UI Styling
 BG_COLOR = "#2e2e2e"
@@ -23,80 +23,132 @@ WINDOW_HEIGHT = 300
 
 # --- REPORT GENERATION LOGIC ---
 
-def run_groundwater_report(status_label):
+def start_worker():
+    """
+    Launches the long-lived report process; it imports the plotting/GIS stack once
+    in the background while the window comes up.
+    """
+    global request_queue, response_queue, worker
+    request_queue = mp.Queue()
+    response_queue = mp.Queue()
+    worker = mp.Process(target=worker_loop, args=(request_queue, response_queue), daemon=True)
+    worker.start()
+
+def stop_worker():
+    """
+    Asks the report process to exit, then closes the window.
+    """
+    request_queue.put(None)
+    worker.join(timeout=2)
+    root.destroy()
+
+def run_report(status_label, report_name, report_key):
     """
-    Runs the subprocesses to generate the groundwater elevation report.
+    Collects the input files and hands the report to the worker process.
     """
+    global report_running
+    if report_running:
+        messagebox.showinfo("Busy", "A report is already being generated.")
+        return
+
+    # The worker reports start-up failures (e.g. a missing dependency) unprompted;
+    # show that before asking for any files
     try:
-        # Update status bar to inform the user
-        status_label.config(text="Step 1/3: Generating contour image...", fg=ACCENT_COLOR)
-        root.update_idletasks() # Force UI update
-        subprocess.run(["python", GENERATE_IMAGE_SCRIPT], check=True, capture_output=True, text=True)
-
-        status_label.config(text="Step 2/3: Generating interactive maps...")
-        root.update_idletasks()
-        subprocess.run(["python", GENERATE_MAPS_SCRIPT], check=True, capture_output=True, text=True)
-
-        status_label.config(text="Step 3/3: Opening report...")
-        root.update_idletasks()
-        if os.path.exists(INTERACTIVE_MAP_HTML):
-            webbrowser.open_new_tab(f"file://{os.path.realpath(INTERACTIVE_MAP_HTML)}")
+        kind, payload = response_queue.get_nowait()
+    except queue.Empty:
+        pass
+    else:
+        if kind == "error":
+            messagebox.showerror("Execution Error", f"The report process could not start:\n\n{payload}")
+            return
+
+    excel_path = filedialog.askopenfilename(
+        parent=root,
+        title="Select Excel File",
+        filetypes=[("Excel files", "*.xlsx *.xls")]
+    )
+    if not excel_path:
+        messagebox.showwarning("No file selected", "Please select an Excel file to proceed.")
+        return
+
+    kmz_path = filedialog.askopenfilename(
+        parent=root,
+        title="Select KMZ File",
+        filetypes=[("KMZ Files", "*.kmz")]
+    )
+    if not kmz_path:
+        messagebox.showwarning("No file selected", "Please select a KMZ file to proceed.")
+        return
+
+    report_running = True
+    status_label.config(text="Starting report...", fg=ACCENT_COLOR)
+    request_queue.put({
+        "report": report_key,
+        "excel_path": excel_path,
+        "kmz_path": kmz_path,
+        "output_html": INTERACTIVE_MAP_HTML,
+    })
+    root.after(POLL_INTERVAL_MS, lambda: poll_report(status_label, report_name))
+
+def poll_report(status_label, report_name):
+    """
+    Drains worker replies on the Tk main loop; reschedules itself until the report finishes.
+    """
+    global report_running
+    while True:
+        try:
+            kind, payload = response_queue.get_nowait()
+        except queue.Empty:
+            break
+
+        if kind == "status":
+            status_label.config(text=payload)
+            continue
+
+        report_running = False
+        if kind == "error":
+            # Provide more specific error feedback
+            messagebox.showerror("Execution Error", f"An error occurred while generating the report:\n\n{payload}")
+        elif os.path.exists(payload):
+            status_label.config(text="Step 3/3: Opening report...")
+            webbrowser.open_new_tab(f"file://{os.path.realpath(payload)}")
             messagebox.showinfo(
                 "Report Ready",
-                f"Groundwater report generated successfully!\n\nThe interactive map '{INTERACTIVE_MAP_HTML}' is opening in your browser."
+                f"{report_name} report generated successfully!\n\nThe interactive map '{payload}' is opening in your browser."
             )
         else:
-            messagebox.showerror("File Not Found", f"Error: Could not find the output file '{INTERACTIVE_MAP_HTML}'.")
-
-    except FileNotFoundError:
-        messagebox.showerror("Error", "Python command not found. Please ensure Python is in your system's PATH.")
-    except subprocess.CalledProcessError as e:
-        # Provide more specific error feedback
-        error_message = f"An error occurred while running a script:\n\nScript: {e.cmd}\n\nError:\n{e.stderr}"
-        messagebox.showerror("Execution Error", error_message)
-    finally:
+            messagebox.showerror("File Not Found", f"Error: Could not find the output file '{payload}'.")
         # Reset status bar
         status_label.config(text="Ready", fg=TEXT_COLOR)
+        return
+
+    if not worker.is_alive():
+        report_running = False
+        status_label.config(text="Ready", fg=TEXT_COLOR)
+        messagebox.showerror("Execution Error", "The report process stopped unexpectedly. Please restart the application.")
+        return
+
+    root.after(POLL_INTERVAL_MS, lambda: poll_report(status_label, report_name))
+
+def run_groundwater_report(status_label):
+    """
+    Generates the groundwater elevation report.
+    """
+    run_report(status_label, "Groundwater", "groundwater")
 
 def run_nitrate_report(status_label):
     """
-    Dummy function to simulate generating a nitrate concentration report.
+    Generates the nitrate concentration report.
     """
-    try:
-        # Update status bar to inform the user
-        status_label.config(text="Step 1/3: Generating contour image...", fg=ACCENT_COLOR)
-        root.update_idletasks() # Force UI update
-        subprocess.run(["python", GENERATE_NITRATE_IMAGE_SCRIPT], check=True, capture_output=True, text=True)
-
-        status_label.config(text="Step 2/3: Generating interactive maps...")
-        root.update_idletasks()
-        subprocess.run(["python", GENERATE_MAPS_SCRIPT], check=True, capture_output=True, text=True)
-
-        status_label.config(text="Step 3/3: Opening report...")
-        root.update_idletasks()
-        if os.path.exists(INTERACTIVE_MAP_HTML):
-            webbrowser.open_new_tab(f"file://{os.path.realpath(INTERACTIVE_MAP_HTML)}")
-            messagebox.showinfo(
-                "Report Ready",
-                f"Groundwater report generated successfully!\n\nThe interactive map '{INTERACTIVE_MAP_HTML}' is opening in your browser."
-            )
-        else:
-            messagebox.showerror("File Not Found", f"Error: Could not find the output file '{INTERACTIVE_MAP_HTML}'.")
-
-    except FileNotFoundError:
-        messagebox.showerror("Error", "Python command not found. Please ensure Python is in your system's PATH.")
-    except subprocess.CalledProcessError as e:
-        # Provide more specific error feedback
-        error_message = f"An error occurred while running a script:\n\nScript: {e.cmd}\n\nError:\n{e.stderr}"
-        messagebox.showerror("Execution Error", error_message)
-    finally:
-        # Reset status bar
-        status_label.config(text="Ready", fg=TEXT_COLOR)
+    run_report(status_label, "Nitrate", "nitrate")
 
 # --- MAIN APPLICATION UI ---
 
+report_running = False
+
 def main():
     global root # Make root global for the status updates
+    start_worker()
     root = tk.Tk()
     root.title("Groundwater Report Generator")
     root.configure(bg=BG_COLOR)
@@ -176,6 +228,7 @@ def main():
     )
     nitrate_button.pack(pady=10)
 
+    root.protocol("WM_DELETE_WINDOW", stop_worker)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,47 @@
+# === report_worker.py ===
+# Long-lived report process: pays the matplotlib/scipy/pyproj/folium import cost once
+# at GUI start-up, then serves report requests from a queue.
+
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+
+def worker_loop(request_queue, response_queue):
+    """
+    Serves {"report", "excel_path", "kmz_path", "output_html"} requests until a None sentinel arrives.
+    Replies with ("status", text) while working, then ("done", html_path) or ("error", details).
+    """
+    # Heavy imports happen here, in the worker, so the GUI process stays light
+    try:
+        from contour_core import GROUNDWATER, NITRATE, render_contour
+        from generate_maps import extract_kmz_points_and_bounds, display_interactive_map
+    except Exception:
+        # Stay alive and answer every request with the import error, so the GUI's
+        # error dialog shows the real cause (e.g. a missing dependency)
+        import_error = traceback.format_exc()
+        response_queue.put(("error", import_error))
+        for _ in iter(request_queue.get, None):
+            response_queue.put(("error", import_error))
+        return
+
+    reports = {"groundwater": GROUNDWATER, "nitrate": NITRATE}
+    # KMZ parsing only depends on kmz_path, so it runs beside the contour render; a single
+    # thread keeps parses (which extract into the same directory) strictly one at a time
+    kmz_executor = ThreadPoolExecutor(max_workers=1)
+
+    for request in iter(request_queue.get, None):
+        try:
+            render_kwargs = reports[request["report"]]
+            kmz_future = kmz_executor.submit(extract_kmz_points_and_bounds, request["kmz_path"])
+
+            response_queue.put(("status", "Step 1/3: Generating contour image..."))
+            render_contour(request["excel_path"], **render_kwargs)
+
+            response_queue.put(("status", "Step 2/3: Generating interactive maps..."))
+            points, image_bounds, bbox = kmz_future.result()
+            display_interactive_map(render_kwargs["out_png"], image_bounds, points, bbox,
+                                    output_html=request["output_html"])
+
+            response_queue.put(("done", request["output_html"]))
+        except Exception:
+            response_queue.put(("error", traceback.format_exc()))